@@ -1,10 +1,13 @@
 import polars as pl
 import numpy as np
+import pyarrow.parquet as pq
 from faker import Faker
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
 import os
+import shutil
+import multiprocessing
 from pathlib import Path
 
 # Configuration parameters (easily adjustable)
@@ -35,14 +38,24 @@ CONFIG = {
     
     # Output configuration
     "output_dir": "./output",
-    "output_formats": ["csv", "parquet"]     # Output formats
+    "output_formats": ["parquet"],           # Output formats ("csv" also supported, but slow and large at this volume)
+    "parquet_row_group_size": 1_000_000,     # Rows per parquet row group
+    
+    # Parallelism
+    "chunk_size": 100_000,         # Rows generated per worker task
+    "num_workers": None,           # Worker processes (None = all CPU cores)
+    "seed": 42                     # Base seed; each chunk derives its own seed from it
 }
 
+# Streaming sinks default to small morsels, which makes sink_parquet far slower than write_parquet
+pl.Config.set_streaming_chunk_size(CONFIG["chunk_size"])
+
 # Set seed for reproducibility
-random.seed(42)
-np.random.seed(42)
+# NumPy draws go through a PCG64 Generator, which is faster than the legacy global np.random state
+random.seed(CONFIG["seed"])
+rng = np.random.default_rng(CONFIG["seed"])
 fake = Faker()
-Faker.seed(42)
+Faker.seed(CONFIG["seed"])
 
 # Calculate total number of claims based on date range and claims per year
 years_span = (CONFIG["end_date"].year - CONFIG["start_date"].year) + (1 if CONFIG["start_date"].month <= CONFIG["end_date"].month else 0)
@@ -241,6 +254,32 @@ for category, codes in denial_categories.items():
     for code in codes:
         category_for_denial_code[code] = category
 
+# Setup denial reason selection based on configuration distribution
+denial_reason_weights = {}
+for category, codes in denial_categories.items():
+    weight = CONFIG["denial_reason_distribution"].get(category, 0.0) / len(codes)
+    for code in codes:
+        denial_reason_weights[code] = weight
+
+# Code keys cached once as arrays for vectorized sampling
+DX_KEYS = np.array(list(diagnosis_codes.keys()))
+PROC_KEYS = np.array(list(procedure_codes.keys()))
+POS_KEYS = np.array(list(place_of_service_codes.keys()))
+REV_KEYS = np.array(list(revenue_codes.keys()))
+HOSPITAL_POS_MASK = np.isin(POS_KEYS, ["21", "23"])  # Inpatient hospital and hospital ER places of service
+
+# Denial reason codes as an index space for vectorized selection ("H1" has no denial_reasons entry)
+TIMELY_FILING_CODES = ["A4", "H1"]
+DENIAL_KEYS = list(denial_reasons.keys()) + [code for code in TIMELY_FILING_CODES if code not in denial_reasons]
+DENIAL_DESCRIPTIONS = [denial_reasons.get(code, "Unknown reason") for code in DENIAL_KEYS]
+DENIAL_PROBS = np.array([denial_reason_weights.get(code, 0.0) for code in DENIAL_KEYS])
+DENIAL_PROBS /= DENIAL_PROBS.sum()
+NO_AUTH_IDX = np.flatnonzero(np.isin(DENIAL_KEYS, denial_categories["no_prior_auth"]))
+EXCLUDED_SERVICE_IDX = np.flatnonzero(np.isin(DENIAL_KEYS, denial_categories["excluded_service"]))
+TIMELY_FILING_IDX = np.flatnonzero(np.isin(DENIAL_KEYS, TIMELY_FILING_CODES))
+# Category per denial reason, as an index into denial_categories (codes outside every category count as "other")
+DENIAL_CATEGORY_LUT = np.array([list(denial_categories).index(category_for_denial_code.get(code, "other")) for code in DENIAL_KEYS])
+
 # Create lists of medical specialties with specialty-specific denial rate modifiers
 specialties = [
     {"name": "Family Medicine", "denial_modifier": 0.9},  # Lower than average denials
@@ -310,97 +349,207 @@ high_denial_procedures = [
     "77066"   # Diagnostic mammography
 ]
 
+# High-denial flag per procedure index, so claims can gather it by procedure code index
+HIGH_DENIAL_MASK = np.isin(PROC_KEYS, high_denial_procedures)
+
+# Pre-built, deduplicated Faker value pools shared by patients and providers. Calling Faker once
+# per row is far too slow for millions of rows, and real populations repeat names and cities anyway
+def faker_pool(generator, size):
+    return np.unique([generator() for _ in range(size)])
+
+# Built once in the driver and handed to patient workers through the pool initializer,
+# so spawned workers (which re-import this module) never call Faker themselves
+def build_faker_pools():
+    return {
+        'male_names': faker_pool(fake.first_name_male, 5_000),
+        'female_names': faker_pool(fake.first_name_female, 5_000),
+        'last_names': faker_pool(fake.last_name, 10_000),
+        'streets': faker_pool(fake.street_address, 20_000),
+        'cities': faker_pool(fake.city, 5_000)
+    }
+
+EMAIL_DOMAINS = np.array(["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com", "icloud.com"])
+STATES = np.array([
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS",
+    "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC",
+    "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+])
+
+# Vectorized string helpers
+def format_ids(prefix, numbers, width):
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(f"U{width}"), width))
+
+def pick(pool, n):
+    # Sample n values with replacement from a pre-built pool
+    return pool[rng.integers(0, len(pool), n)]
+
+def masked(values, mask):
+    # Column of values, null wherever mask is False
+    return pl.Series(values).scatter(np.flatnonzero(~mask), None)
+
+def decode(codes, categories):
+    # Enum column from integer codes into a small category table (no per-row strings are built)
+    categories = list(categories)
+    return pl.Series(categories, dtype=pl.Enum(categories)).gather(codes)
+
+def random_zips(n):
+    return np.char.zfill(rng.integers(501, 99951, n).astype("U5"), 5)
+
+def random_phones(n):
+    area = rng.integers(201, 990, n).astype("U3")
+    exchange = rng.integers(200, 1000, n).astype("U3")
+    line = np.char.zfill(rng.integers(0, 10000, n).astype("U4"), 4)
+    return np.char.add(np.char.add(np.char.add("(", area), np.char.add(") ", exchange)), np.char.add("-", line))
+
+# Read-only lookups shared with worker processes (set by the pool initializer)
+_worker_context = {}
+
+def _init_worker(context):
+    global _worker_context
+    _worker_context = context
+
+# Reseed every random source in a worker process from its own SeedSequence
+def _seed_worker(seed_seq):
+    global rng
+    rng = np.random.default_rng(seed_seq)
+    seed = int(seed_seq.generate_state(1)[0])
+    random.seed(seed)
+    Faker.seed(seed)
+
+# Generate one chunk in a worker process and write it to its own parquet part file
+def _write_chunk(task):
+    chunk_fn, start, end, seed_seq, part_path = task
+    _seed_worker(seed_seq)
+    # Single-chunk columns keep the parquet write on its fast path
+    df = chunk_fn(start, end).rechunk()
+    assert df.n_chunks("all") == [1] * df.width
+    df.write_parquet(part_path)
+    return end - start
+
+# Run chunk_fn over [0, num_rows) in parallel, one task per chunk, and scan the parts back lazily.
+# Chunks are built in separate worker processes, so there are no driver-side full-length column arrays to
+# preallocate; the part files play that role and are never concatenated in memory
+def generate_in_chunks(chunk_fn, num_rows, name, seed_offset, context=None):
+    chunk_size = CONFIG["chunk_size"]
+    part_dir = Path(CONFIG["output_dir"]) / f"_{name}_parts"
+    shutil.rmtree(part_dir, ignore_errors=True)
+    part_dir.mkdir(parents=True)
+    
+    # Each chunk gets an independent random stream spawned from the base seed
+    starts = range(0, num_rows, chunk_size)
+    seed_seqs = np.random.SeedSequence([CONFIG["seed"], seed_offset]).spawn(len(starts))
+    tasks = [
+        (chunk_fn, start, min(start + chunk_size, num_rows), seed_seqs[n], str(part_dir / f"part-{n:05d}.parquet"))
+        for n, start in enumerate(starts)
+    ]
+    
+    # Use "spawn" workers: forking a process that has already started Polars' thread pool can deadlock
+    generated = 0
+    mp_context = multiprocessing.get_context("spawn")
+    with mp_context.Pool(CONFIG["num_workers"], initializer=_init_worker, initargs=(context or {},)) as pool:
+        for rows in pool.imap_unordered(_write_chunk, tasks):
+            generated += rows
+            print(f"  Generated {generated} {name}...")
+    
+    return pl.scan_parquet(part_dir / "part-*.parquet")
+
+# Remove the chunk part files once everything that scans them has been written
+def remove_chunk_parts():
+    for part_dir in Path(CONFIG["output_dir"]).glob("_*_parts"):
+        shutil.rmtree(part_dir)
+
+# Create one chunk of patient data (rows [i, end)) from the Faker pools in the worker context
+def _gen_patient_chunk(i, end):
+    pools = _worker_context
+    chunk_size_actual = end - i
+    today = np.datetime64(datetime.now().date(), "D")
+
+    patient_ids = format_ids("P", np.arange(i + 1, end + 1), 8)
+    gender_codes = rng.integers(0, 2, chunk_size_actual, dtype=np.uint8)  # 0 = M, 1 = F
+
+    # Sample names from the pre-built pools
+    first_names = np.where(
+        gender_codes == 0,
+        pick(pools['male_names'], chunk_size_actual),
+        pick(pools['female_names'], chunk_size_actual)
+    )
+    last_names = pick(pools['last_names'], chunk_size_actual)
+
+    # Ages between 1 and 95 years, as whole days before today
+    dobs = today - rng.integers(365, 96 * 365, chunk_size_actual).astype("timedelta64[D]")
+
+    emails = np.char.add(
+        np.char.add(np.char.lower(first_names), "."),
+        np.char.add(np.char.lower(last_names), np.char.add("@", EMAIL_DOMAINS[rng.integers(0, len(EMAIL_DOMAINS), chunk_size_actual)]))
+    )
+
+    # Generate random insurance IDs with weighted distribution (some payers are more common)
+    insurance_ids = format_ids("INS", rng.integers(1, CONFIG['num_payers'] + 1, chunk_size_actual), 3)
+    
+    # Generate some chronic conditions: up to 4 distinct diagnoses per patient, joined as a comma-separated string
+    num_conditions = rng.choice(5, chunk_size_actual, p=[0.6, 0.2, 0.1, 0.07, 0.03])
+    picks = np.argpartition(rng.random((chunk_size_actual, len(DX_KEYS))), 4, axis=1)[:, :4]
+    chronic_conditions = pl.DataFrame({
+        f"c{slot}": masked(DX_KEYS[picks[:, slot]], num_conditions > slot) for slot in range(4)
+    }).select(
+        pl.when(pl.col("c0").is_not_null())
+        .then(pl.concat_str([pl.col(f"c{slot}") for slot in range(4)], separator=",", ignore_nulls=True))
+    ).to_series()
+    
+    chunk_data = {
+        'patient_id': patient_ids,
+        'first_name': first_names,
+        'last_name': last_names,
+        'dob': dobs,
+        'gender': decode(gender_codes, ['M', 'F']),
+        'address': pick(pools['streets'], chunk_size_actual),
+        'city': pick(pools['cities'], chunk_size_actual),
+        'state': decode(rng.integers(0, len(STATES), chunk_size_actual, dtype=np.uint8), STATES),
+        'zip': random_zips(chunk_size_actual),
+        'phone': random_phones(chunk_size_actual),
+        'email': emails,
+        'insurance_id': insurance_ids,
+        'membership_id': format_ids("MEM", rng.integers(0, 10**10, chunk_size_actual, dtype=np.int64), 10),
+        'chronic_conditions': chronic_conditions
+    }
+    
+    return pl.DataFrame(chunk_data)
+
 # Create patient data (optimized for large dataset)
-def generate_patients(num_patients):
+def generate_patients(num_patients, pools):
     print(f"Generating {num_patients} patients...")
-    
-    # Generate data in chunks for memory efficiency
-    chunk_size = 100000
-    all_chunks = []
-    
-    for i in range(0, num_patients, chunk_size):
-        end = min(i + chunk_size, num_patients)
-        chunk_size_actual = end - i
-        
-        patient_ids = [f"P{str(j+1).zfill(8)}" for j in range(i, end)]
-        genders = [random.choice(['M', 'F']) for _ in range(chunk_size_actual)]
-        
-        first_names = []
-        for g in genders:
-            if g == 'M':
-                first_names.append(fake.first_name_male())
-            else:
-                first_names.append(fake.first_name_female())
-        
-        dobs = [fake.date_of_birth(minimum_age=1, maximum_age=95) for _ in range(chunk_size_actual)]
-        
-        # Generate random insurance IDs with weighted distribution (some payers are more common)
-        insurance_ids = [f"INS{str(random.randint(1, CONFIG['num_payers'])).zfill(3)}" for _ in range(chunk_size_actual)]
-        
-        # Generate some chronic conditions
-        chronic_conditions = []
-        for _ in range(chunk_size_actual):
-            num_conditions = random.choices([0, 1, 2, 3, 4], weights=[0.6, 0.2, 0.1, 0.07, 0.03])[0]
-            if num_conditions > 0:
-                conditions = random.sample(list(diagnosis_codes.keys()), num_conditions)
-                chronic_conditions.append(','.join(conditions))
-            else:
-                chronic_conditions.append(None)
-        
-        chunk_data = {
-            'patient_id': patient_ids,
-            'first_name': first_names,
-            'last_name': [fake.last_name() for _ in range(chunk_size_actual)],
-            'dob': dobs,
-            'gender': genders,
-            'address': [fake.street_address() for _ in range(chunk_size_actual)],
-            'city': [fake.city() for _ in range(chunk_size_actual)],
-            'state': [fake.state_abbr() for _ in range(chunk_size_actual)],
-            'zip': [fake.zipcode() for _ in range(chunk_size_actual)],
-            'phone': [fake.phone_number() for _ in range(chunk_size_actual)],
-            'email': [fake.email() for _ in range(chunk_size_actual)],
-            'insurance_id': insurance_ids,
-            'membership_id': [f"MEM{fake.numerify('##########')}" for _ in range(chunk_size_actual)],
-            'chronic_conditions': chronic_conditions
-        }
-        
-        all_chunks.append(pl.DataFrame(chunk_data))
-        
-        if i % (chunk_size * 10) == 0:
-            print(f"  Generated {i + chunk_size_actual} patients...")
-    
-    return pl.concat(all_chunks)
+    return generate_in_chunks(_gen_patient_chunk, num_patients, "patients", seed_offset=0, context=pools)
 
 # Create provider data
-def generate_providers(num_providers):
+def generate_providers(num_providers, pools):
     print(f"Generating {num_providers} providers...")
     
     providers = []
     
     # Create provider data in a more efficient way
-    provider_ids = [f"DR{str(i+1).zfill(7)}" for i in range(num_providers)]
+    provider_ids = format_ids("DR", np.arange(1, num_providers + 1), 7)
     
     # Randomly select specialties with their denial modifiers
-    selected_specialties = [random.choice(specialties) for _ in range(num_providers)]
-    specialty_names = [s["name"] for s in selected_specialties]
-    specialty_modifiers = [s["denial_modifier"] for s in selected_specialties]
+    specialty_idx = rng.integers(0, len(specialties), num_providers)
+    specialty_names = np.array([s["name"] for s in specialties])[specialty_idx]
+    specialty_modifiers = np.array([s["denial_modifier"] for s in specialties])[specialty_idx]
     
     providers_data = {
         'provider_id': provider_ids,
-        'provider_name': [f"Dr. {fake.last_name()}" for _ in range(num_providers)],
-        'npi': [fake.numerify('##########') for _ in range(num_providers)],  # National Provider Identifier
+        'provider_name': np.char.add("Dr. ", pick(pools['last_names'], num_providers)),
+        'npi': format_ids("", rng.integers(0, 10**10, num_providers, dtype=np.int64), 10),  # National Provider Identifier
         'specialty': specialty_names,
         'specialty_denial_modifier': specialty_modifiers,
-        'facility_name': [f"ANEC Medical Center {random.randint(1, 25)}" for _ in range(num_providers)],
-        'address': [fake.street_address() for _ in range(num_providers)],
-        'city': [fake.city() for _ in range(num_providers)],
-        'state': [fake.state_abbr() for _ in range(num_providers)],
-        'zip': [fake.zipcode() for _ in range(num_providers)],
-        'phone': [fake.phone_number() for _ in range(num_providers)],
-        'network_status': [random.choice(['In-Network', 'Out-of-Network']) for _ in range(num_providers)],
-        'years_experience': [random.randint(1, 40) for _ in range(num_providers)],
-        'credentials': [random.choice(['MD', 'DO', 'NP', 'PA']) for _ in range(num_providers)],
-        'average_patients_per_day': [random.randint(5, 40) for _ in range(num_providers)]
+        'facility_name': np.char.add("ANEC Medical Center ", rng.integers(1, 26, num_providers).astype("U2")),
+        'address': pick(pools['streets'], num_providers),
+        'city': pick(pools['cities'], num_providers),
+        'state': pick(STATES, num_providers),
+        'zip': random_zips(num_providers),
+        'phone': random_phones(num_providers),
+        'network_status': pick(np.array(['In-Network', 'Out-of-Network']), num_providers),
+        'years_experience': rng.integers(1, 41, num_providers, dtype=np.int8),
+        'credentials': pick(np.array(['MD', 'DO', 'NP', 'PA']), num_providers),
+        'average_patients_per_day': rng.integers(5, 41, num_providers, dtype=np.int8)
     }
     
     return pl.DataFrame(providers_data)
@@ -416,333 +565,295 @@ def generate_payers(num_payers):
     selected_payers = random.sample(payer_info, actual_num_payers)
     
     payers_data = {
-        'payer_id': [f"INS{str(i+1).zfill(3)}" for i in range(actual_num_payers)],
+        'payer_id': format_ids("INS", np.arange(1, actual_num_payers + 1), 3),
         'payer_name': [p["name"] for p in selected_payers],
         'payer_type': [p["type"] for p in selected_payers],
         'payer_denial_modifier': [p["denial_modifier"] for p in selected_payers],
         'average_processing_days': [random.randint(7, 45) for _ in range(actual_num_payers)],
         'electronic_claim_submission': [random.choice([True, False]) for _ in range(actual_num_payers)],
-        'prior_auth_required_procedures': [','.join(random.sample(list(procedure_codes.keys()), random.randint(5, 15))) for _ in range(actual_num_payers)],
+        'prior_auth_required_procedures': [','.join(random.sample(PROC_KEYS.tolist(), random.randint(5, 15))) for _ in range(actual_num_payers)],
         'base_denial_rate': [round(CONFIG["overall_denial_rate"] * p["denial_modifier"], 3) for p in selected_payers],
         'average_reimbursement_rate': [round(random.uniform(0.50, 0.95), 2) for _ in range(actual_num_payers)],
         'timely_filing_limit_days': [random.choice([30, 60, 90, 120, 180, 365]) for _ in range(actual_num_payers)],
         'appeal_timeframe_days': [random.choice([30, 45, 60, 90]) for _ in range(actual_num_payers)],
-        'contact_phone': [fake.phone_number() for _ in range(actual_num_payers)],
+        'contact_phone': random_phones(actual_num_payers),
         'website': [f"www.{p['name'].lower().replace(' ', '')}.com" for p in selected_payers]
     }
     
     return pl.DataFrame(payers_data)
 
+# Create the code description lookup table. Claims only carry the codes; descriptions are joined in at read time, e.g.
+#   claims.join(codes.filter(pl.col("code_type") == "procedure"), left_on="procedure_code", right_on="code")
+def generate_code_descriptions():
+    code_tables = {
+        "diagnosis": diagnosis_codes,
+        "procedure": procedure_codes,
+        "place_of_service": place_of_service_codes,
+        "revenue": revenue_codes
+    }
+    
+    return pl.DataFrame({
+        'code': [code for table in code_tables.values() for code in table],
+        'code_type': [code_type for code_type, table in code_tables.items() for _ in table],
+        'description': [description for table in code_tables.values() for description in table.values()]
+    })
+
+# Create one chunk of claims data (rows [chunk_start, chunk_end)) from the shared worker context
+def _gen_claim_chunk(chunk_start, chunk_end):
+    payer_denial_rates = _worker_context['payer_denial_rates']
+    prior_auth_matrix = _worker_context['prior_auth_matrix']
+    provider_denial_modifiers = _worker_context['provider_denial_modifiers']
+    provider_out_of_network = _worker_context['provider_out_of_network']
+    num_patients = _worker_context['num_patients']
+    provider_ids = _worker_context['provider_ids']
+    days_in_range = _worker_context['days_in_range']
+    start_date = _worker_context['start_date']
+    end_date = _worker_context['end_date']
+    
+    # Time between service and claim submission (days)
+    submission_lag_days = np.array([1, 2, 3, 5, 7, 10, 14, 21, 30, 45, 60, 90])
+    submission_lag_weights = np.array([0.15, 0.15, 0.15, 0.10, 0.10, 0.10, 0.05, 0.05, 0.05, 0.05, 0.03, 0.02])
+    submission_lag_weights = submission_lag_weights / submission_lag_weights.sum()
+    
+    actual_chunk_size = chunk_end - chunk_start
+    
+    # Generate claim IDs
+    claim_ids = format_ids("CLM", np.arange(chunk_start + 1, chunk_end + 1), 10)
+    
+    # Randomly select patients; their IDs are sequential (P00000001 ...), so they are formatted from the drawn numbers
+    selected_patient_ids = format_ids("P", rng.integers(1, num_patients + 1, actual_chunk_size), 8)
+    
+    # Randomly select providers (by index, so per-provider lookups are array gathers)
+    selected_provider_idx = rng.integers(0, len(provider_ids), actual_chunk_size)
+    selected_provider_ids = provider_ids[selected_provider_idx]
+    
+    # Randomly select payers (INS001 is index 0)
+    selected_payer_idx = rng.integers(0, CONFIG['num_payers'], actual_chunk_size, dtype=np.int16)
+    
+    # Generate service dates (within the date range) as whole-day offsets from the start date
+    start_day = np.datetime64(start_date.date(), "D")
+    end_day = np.datetime64(end_date.date(), "D")
+    service_dates = start_day + rng.integers(0, days_in_range + 1, actual_chunk_size).astype("timedelta64[D]")
+    
+    # Calculate submission lags and dates
+    submission_lags = rng.choice(submission_lag_days, actual_chunk_size, p=submission_lag_weights)
+    submission_dates = np.minimum(service_dates + submission_lags.astype("timedelta64[D]"), end_day)
+    
+    # Generate diagnoses as code indices (primary and candidate secondary in one draw)
+    diagnosis_idx = rng.integers(0, len(DX_KEYS), (actual_chunk_size, 2), dtype=np.int16)
+    has_secondary = rng.random(actual_chunk_size) < 0.4  # 40% chance of secondary diagnosis
+    primary_diagnosis_idx = diagnosis_idx[:, 0]
+    secondary_diagnosis_idx = masked(diagnosis_idx[:, 1], has_secondary)
+    
+    # Generate procedures
+    selected_procedure_idx = rng.integers(0, len(PROC_KEYS), actual_chunk_size, dtype=np.int16)
+    
+    # Generate place of service
+    place_of_service_idx = rng.integers(0, len(POS_KEYS), actual_chunk_size, dtype=np.int16)
+    
+    # Generate revenue codes
+    has_revenue_code = rng.random(actual_chunk_size) < 0.7  # 70% chance of having revenue code
+    revenue_idx = masked(rng.integers(0, len(REV_KEYS), actual_chunk_size, dtype=np.int16), has_revenue_code)
+    
+    # Determine prior authorization status
+    prior_auth_required = prior_auth_matrix[selected_payer_idx, selected_procedure_idx]
+    prior_auth_obtained = prior_auth_required & (rng.random(actual_chunk_size) < 0.85)  # 85% compliance rate
+    
+    # Calculate charge amounts
+    base_charges = rng.uniform(50, 5000, actual_chunk_size)
+    
+    # Hospital settings have higher charges
+    charge_multipliers = np.where(HOSPITAL_POS_MASK[place_of_service_idx], rng.uniform(1.5, 3.0, actual_chunk_size), 1.0)
+    # Money is kept as exact integer cents, so sums and differences have no float error
+    # (Int64, since Polars sums Int32 columns in Int32 and would overflow at this volume)
+    charge_cents = np.rint(base_charges * charge_multipliers * 100).astype(np.int64)
+    
+    # Compute denial probabilities for the whole chunk at once
+    needs_auth = prior_auth_required & ~prior_auth_obtained
+    out_of_network = provider_out_of_network[selected_provider_idx]
+    high_denial = HIGH_DENIAL_MASK[selected_procedure_idx]
+    timely_filing_limits = rng.choice(np.array([30, 60, 90, 120, 180, 365]), actual_chunk_size)  # Simulating payer's limit
+    
+    denial_probability = (
+        payer_denial_rates[selected_payer_idx] * provider_denial_modifiers[selected_provider_idx]  # Payer base rate modified by provider specialty
+        + 0.60 * needs_auth  # Significant increase if no prior auth
+        + 0.20 * out_of_network  # Higher for out-of-network
+        + 0.15 * high_denial  # Higher for certain procedures
+        + 0.30 * (submission_lags > timely_filing_limits * 0.8)  # Higher if close to timely filing limit
+    )
+    
+    # Cap the denial probability at 0.95 and determine claim status
+    denial_probability = np.minimum(denial_probability, 0.95)
+    is_denied = rng.random(actual_chunk_size) < denial_probability
+    
+    # Format claim status according to configuration
+    if CONFIG["claim_status_format"] == "numeric":
+        claim_statuses = is_denied.astype(np.int8)  # 1 = DENIED, 0 = APPROVED
+    elif CONFIG["claim_status_format"] == "boolean":
+        claim_statuses = is_denied  # True = DENIED, False = APPROVED
+    else:  # string format
+        claim_statuses = np.where(is_denied, "DENIED", "APPROVED")
+    
+    # Out-of-network denials are attributed to an excluded service half of the time
+    excluded_out_of_network = out_of_network & (rng.random(actual_chunk_size) < 0.5)
+    
+    # Select denial reasons (as DENIAL_KEYS indices) for denied claims: weighted random selection based on the
+    # configured distribution, overridden in increasing precedence by late filing, excluded service and missing auth
+    denial_reason_idx = rng.choice(len(DENIAL_KEYS), actual_chunk_size, p=DENIAL_PROBS)
+    denial_reason_idx = np.where(submission_lags > timely_filing_limits, pick(TIMELY_FILING_IDX, actual_chunk_size), denial_reason_idx)
+    denial_reason_idx = np.where(excluded_out_of_network, pick(EXCLUDED_SERVICE_IDX, actual_chunk_size), denial_reason_idx)
+    denial_reason_idx = np.where(needs_auth, pick(NO_AUTH_IDX, actual_chunk_size), denial_reason_idx)
+    denial_reason_idx = masked(denial_reason_idx, is_denied)
+    
+    # Calculate payment amounts based on random reimbursement rates (no payment for denied claims)
+    reimbursement_rates = rng.uniform(0.5, 0.95, actual_chunk_size)
+    payment_cents = np.rint(charge_cents * reimbursement_rates).astype(np.int64)
+    
+    # Patient responsible for full amount if denied
+    patient_responsibility_cents = np.where(is_denied, charge_cents, charge_cents - payment_cents)
+    payment_cents = masked(payment_cents, ~is_denied)
+    
+    # Generate processing dates
+    processing_days = rng.integers(3, 31, actual_chunk_size).astype("timedelta64[D]")
+    processing_dates = np.minimum(submission_dates + processing_days, end_day)
+    
+    # Calculate days to payment (none for denied claims)
+    days_to_payment = masked((processing_dates - submission_dates).astype(np.int16), ~is_denied)
+    
+    # Claim frequency types
+    claim_frequencies = rng.choice(np.array([1, 2, 3], dtype=np.int8), actual_chunk_size, p=[0.85, 0.10, 0.05])
+    
+    # Combine all data into a dataframe
+    claims_data = {
+        'claim_id': claim_ids,
+        'patient_id': selected_patient_ids,
+        'provider_id': selected_provider_ids,
+        'payer_id': decode(selected_payer_idx, format_ids("INS", np.arange(1, CONFIG['num_payers'] + 1), 3)),
+        'service_date': service_dates,
+        'submission_date': submission_dates,
+        'processing_date': processing_dates,
+        'primary_diagnosis_code': decode(primary_diagnosis_idx, DX_KEYS),
+        'secondary_diagnosis_code': decode(secondary_diagnosis_idx, DX_KEYS),
+        'procedure_code': decode(selected_procedure_idx, PROC_KEYS),
+        'revenue_code': decode(revenue_idx, REV_KEYS),
+        'place_of_service_code': decode(place_of_service_idx, POS_KEYS),
+        'prior_auth_required': prior_auth_required,
+        'prior_auth_obtained': prior_auth_obtained,
+        'charge_amount_cents': charge_cents,
+        'claim_status': claim_statuses,
+        'denial_reason_code': decode(denial_reason_idx, DENIAL_KEYS),
+        # Descriptions repeat across codes, so they can't be Enum categories; save_dataframe dictionary-encodes them
+        'denial_reason_description': pl.Series(DENIAL_DESCRIPTIONS).gather(denial_reason_idx),
+        'payment_amount_cents': payment_cents,
+        'patient_responsibility_cents': patient_responsibility_cents,
+        'claim_frequency': claim_frequencies,
+        'days_to_payment': days_to_payment
+    }
+    
+    return pl.DataFrame(claims_data)
+
 # Create claims data - optimized for large datasets
 def generate_claims(num_claims, patients_df, providers_df, payers_df, start_date, end_date):
     print(f"Generating {num_claims} claims...")
     
-    # Create a map of payer ID to denial rate for faster lookups
-    payer_base_denial_rates = dict(zip(payers_df['payer_id'].to_list(), payers_df['base_denial_rate'].to_list()))
-    payer_prior_auth_lists = dict(zip(payers_df['payer_id'].to_list(), payers_df['prior_auth_required_procedures'].to_list()))
+    # Payer lookup tables indexed by payer number (INS001 is index 0); payers without a row keep the defaults
+    payer_idx = payers_df['payer_id'].str.slice(3).cast(pl.Int64).to_numpy() - 1
+    payer_denial_rates = np.full(CONFIG['num_payers'], CONFIG["overall_denial_rate"])
+    payer_denial_rates[payer_idx] = payers_df['base_denial_rate'].to_numpy()
     
-    # Create a map of provider ID to denial modifier for faster lookups
-    provider_denial_modifiers = dict(zip(providers_df['provider_id'].to_list(), providers_df['specialty_denial_modifier'].to_list()))
-    provider_network_status = dict(zip(providers_df['provider_id'].to_list(), providers_df['network_status'].to_list()))
+    # Prior auth requirements as a [payer index, procedure index] boolean matrix
+    prior_auth_matrix = np.zeros((CONFIG['num_payers'], len(PROC_KEYS)), dtype=bool)
+    for idx, procs in zip(payer_idx, payers_df['prior_auth_required_procedures']):
+        prior_auth_matrix[idx] = np.isin(PROC_KEYS, procs.split(','))
     
-    # Time between service and claim submission (days)
-    submission_lag_days = [1, 2, 3, 5, 7, 10, 14, 21, 30, 45, 60, 90]
-    submission_lag_weights = [0.15, 0.15, 0.15, 0.10, 0.10, 0.10, 0.05, 0.05, 0.05, 0.05, 0.03, 0.02]
+    # Provider lookup tables are simply the provider columns, indexed by row
+    provider_modifiers = providers_df['specialty_denial_modifier'].to_numpy()
+    provider_out_of_network = (providers_df['network_status'] == 'Out-of-Network').to_numpy()
     
-    # Generate claims in chunks to save memory
-    chunk_size = 100000
-    all_claim_chunks = []
-    
-    # Convert patient IDs to list for random selection
-    patient_ids = patients_df['patient_id'].to_list()
-    provider_ids = providers_df['provider_id'].to_list()
+    # Patients are drawn by number, so workers only need the count rather than a copy of every patient ID
+    num_patients = frame_height(patients_df)
+    provider_ids = providers_df['provider_id'].to_numpy()
     
     # Calculate days in range for date generation
     days_in_range = (end_date - start_date).days
     
-    # Setup denial reason selection based on configuration distribution
-    denial_reason_weights = {}
-    for category, codes in denial_categories.items():
-        weight = CONFIG["denial_reason_distribution"].get(category, 0.0) / len(codes)
-        for code in codes:
-            denial_reason_weights[code] = weight
-    
-    for chunk_start in range(0, num_claims, chunk_size):
-        chunk_end = min(chunk_start + chunk_size, num_claims)
-        actual_chunk_size = chunk_end - chunk_start
-        
-        # Generate claim IDs
-        claim_ids = [f"CLM{str(i+1).zfill(10)}" for i in range(chunk_start, chunk_end)]
-        
-        # Randomly select patients
-        selected_patient_ids = [random.choice(patient_ids) for _ in range(actual_chunk_size)]
-        
-        # Randomly select providers
-        selected_provider_ids = [random.choice(provider_ids) for _ in range(actual_chunk_size)]
-        
-        # Randomly select payer IDs
-        selected_payer_ids = [f"INS{str(random.randint(1, CONFIG['num_payers'])).zfill(3)}" for _ in range(actual_chunk_size)]
-        
-        # Generate service dates (within the date range)
-        service_dates = [start_date + timedelta(days=random.randint(0, days_in_range)) for _ in range(actual_chunk_size)]
-        
-        # Calculate submission lags and dates
-        submission_lags = [random.choices(submission_lag_days, submission_lag_weights)[0] for _ in range(actual_chunk_size)]
-        submission_dates = [min(service_date + timedelta(days=lag), end_date) for service_date, lag in zip(service_dates, submission_lags)]
-        
-        # Generate diagnoses
-        primary_diagnoses = [random.choice(list(diagnosis_codes.keys())) for _ in range(actual_chunk_size)]
-        has_secondary = [random.random() < 0.4 for _ in range(actual_chunk_size)]  # 40% chance of secondary diagnosis
-        secondary_diagnoses = [random.choice(list(diagnosis_codes.keys())) if has_sec else None for has_sec in has_secondary]
-        
-        # Generate procedures
-        procedure_codes_list = list(procedure_codes.keys())
-        selected_procedures = [random.choice(procedure_codes_list) for _ in range(actual_chunk_size)]
-        
-        # Generate place of service
-        places_of_service = [random.choice(list(place_of_service_codes.keys())) for _ in range(actual_chunk_size)]
-        
-        # Generate revenue codes
-        has_revenue_code = [random.random() < 0.7 for _ in range(actual_chunk_size)]  # 70% chance of having revenue code
-        revenue_codes_list = [random.choice(list(revenue_codes.keys())) if has_rev else None for has_rev in has_revenue_code]
-        
-        # Determine prior authorization status
-        prior_auth_required = []
-        prior_auth_obtained = []
-        
-        for i in range(actual_chunk_size):
-            payer_id = selected_payer_ids[i]
-            procedure = selected_procedures[i]
-            payer_auth_list = payer_prior_auth_lists.get(payer_id, '').split(',')
-            
-            if procedure in payer_auth_list:
-                prior_auth_required.append(True)
-                prior_auth_obtained.append(random.random() < 0.85)  # 85% compliance rate
-            else:
-                prior_auth_required.append(False)
-                prior_auth_obtained.append(False)
-        
-        # Calculate charge amounts
-        base_charges = [random.uniform(50, 5000) for _ in range(actual_chunk_size)]
-        charge_amounts = []
-        
-        for i in range(actual_chunk_size):
-            charge = base_charges[i]
-            place = places_of_service[i]
-            
-            # Hospital settings have higher charges
-            if place in ["21", "23"]:
-                charge *= random.uniform(1.5, 3.0)
-                
-            charge_amounts.append(round(charge, 2))
-        
-        # Determine claim status and denial reason
-        claim_statuses = []
-        denial_reason_codes = []
-        denial_reason_descriptions = []
-        
-        for i in range(actual_chunk_size):
-            payer_id = selected_payer_ids[i]
-            provider_id = selected_provider_ids[i]
-            procedure = selected_procedures[i]
-            
-            # Base denial rate from payer
-            base_denial_prob = payer_base_denial_rates.get(payer_id, CONFIG["overall_denial_rate"])
-            
-            # Modify by provider specialty
-            provider_modifier = provider_denial_modifiers.get(provider_id, 1.0)
-            denial_probability = base_denial_prob * provider_modifier
-            
-            # Adjust denial probability based on various factors
-            if prior_auth_required[i] and not prior_auth_obtained[i]:
-                denial_probability += 0.60  # Significant increase if no prior auth
-            
-            if provider_network_status.get(provider_id) == 'Out-of-Network':
-                denial_probability += 0.20  # Higher for out-of-network
-            
-            if procedure in high_denial_procedures:
-                denial_probability += 0.15  # Higher for certain procedures
-            
-            timely_filing_limit = random.choice([30, 60, 90, 120, 180, 365])  # Simulating payer's limit
-            if submission_lags[i] > (timely_filing_limit * 0.8):
-                denial_probability += 0.30  # Higher if close to timely filing limit
-                
-            # Cap the denial probability at 0.95
-            denial_probability = min(denial_probability, 0.95)
-            
-            # Determine claim status
-            is_denied = random.random() < denial_probability
-            
-            # Format claim status according to configuration
-            if is_denied:
-                if CONFIG["claim_status_format"] == "numeric":
-                    claim_statuses.append(1)  # 1 = DENIED
-                elif CONFIG["claim_status_format"] == "boolean":
-                    claim_statuses.append(True)  # True = DENIED
-                else:  # string format
-                    claim_statuses.append("DENIED")
-                    
-                # Select denial reason based on configured distribution
-                if prior_auth_required[i] and not prior_auth_obtained[i]:
-                    denial_code = random.choice(denial_categories["no_prior_auth"])
-                elif provider_network_status.get(provider_id) == 'Out-of-Network' and random.random() < 0.5:
-                    denial_code = random.choice(denial_categories["excluded_service"])
-                elif submission_lags[i] > timely_filing_limit:
-                    denial_code = random.choice(["A4", "H1"])  # Timely filing related codes
-                else:
-                    # Use weighted random selection based on distribution
-                    denial_code = random.choices(
-                        list(denial_reason_weights.keys()),
-                        weights=list(denial_reason_weights.values())
-                    )[0]
-                
-                denial_reason_codes.append(denial_code)
-                denial_reason_descriptions.append(denial_reasons.get(denial_code, "Unknown reason"))
-            else:
-                if CONFIG["claim_status_format"] == "numeric":
-                    claim_statuses.append(0)  # 0 = APPROVED
-                elif CONFIG["claim_status_format"] == "boolean":
-                    claim_statuses.append(False)  # False = APPROVED
-                else:  # string format
-                    claim_statuses.append("APPROVED")
-                
-                denial_reason_codes.append(None)
-                denial_reason_descriptions.append(None)
-        
-        # Calculate payment amounts
-        payment_amounts = []
-        patient_responsibilities = []
-        
-        for i in range(actual_chunk_size):
-            charge = charge_amounts[i]
-            is_denied = (claim_statuses[i] == 1 if CONFIG["claim_status_format"] == "numeric" else 
-                        claim_statuses[i] == True if CONFIG["claim_status_format"] == "boolean" else 
-                        claim_statuses[i] == "DENIED")
-            
-            if is_denied:
-                payment_amounts.append(None)
-                patient_responsibilities.append(charge)  # Patient responsible for full amount if denied
-            else:
-                # Calculate payment based on random reimbursement rate
-                reimbursement_rate = random.uniform(0.5, 0.95)
-                payment = round(charge * reimbursement_rate, 2)
-                payment_amounts.append(payment)
-                patient_responsibilities.append(round(charge - payment, 2))
-        
-        # Generate processing dates
-        processing_dates = []
-        for i in range(actual_chunk_size):
-            processing_days = random.randint(3, 30)
-            proc_date = submission_dates[i] + timedelta(days=processing_days)
-            if proc_date > end_date:
-                proc_date = end_date
-            processing_dates.append(proc_date)
-        
-        # Calculate days to payment
-        days_to_payment = []
-        for i in range(actual_chunk_size):
-            is_denied = (claim_statuses[i] == 1 if CONFIG["claim_status_format"] == "numeric" else 
-                        claim_statuses[i] == True if CONFIG["claim_status_format"] == "boolean" else 
-                        claim_statuses[i] == "DENIED")
-            
-            if is_denied:
-                days_to_payment.append(None)
-            else:
-                days_to_payment.append((processing_dates[i] - submission_dates[i]).days)
-        
-        # Claim frequency types
-        claim_frequencies = [random.choices([1, 2, 3], weights=[0.85, 0.10, 0.05])[0] for _ in range(actual_chunk_size)]
-        
-        # Create diagnostic and procedure description columns
-        primary_diag_descriptions = [diagnosis_codes[code] for code in primary_diagnoses]
-        secondary_diag_descriptions = [diagnosis_codes.get(code) if code else None for code in secondary_diagnoses]
-        procedure_descriptions = [procedure_codes[code] for code in selected_procedures]
-        place_descriptions = [place_of_service_codes[code] for code in places_of_service]
-        revenue_descriptions = [revenue_codes.get(code) if code else None for code in revenue_codes_list]
-        
-        # Combine all data into a dataframe
-        claims_data = {
-            'claim_id': claim_ids,
-            'patient_id': selected_patient_ids,
-            'provider_id': selected_provider_ids,
-            'payer_id': selected_payer_ids,
-            'service_date': service_dates,
-            'submission_date': submission_dates,
-            'processing_date': processing_dates,
-            'primary_diagnosis_code': primary_diagnoses,
-            'primary_diagnosis_description': primary_diag_descriptions,
-            'secondary_diagnosis_code': secondary_diagnoses,
-            'secondary_diagnosis_description': secondary_diag_descriptions,
-            'procedure_code': selected_procedures,
-            'procedure_description': procedure_descriptions,
-            'revenue_code': revenue_codes_list,
-            'revenue_description': revenue_descriptions,
-            'place_of_service_code': places_of_service,
-            'place_of_service_description': place_descriptions,
-            'prior_auth_required': prior_auth_required,
-            'prior_auth_obtained': prior_auth_obtained,
-            'charge_amount': charge_amounts,
-            'claim_status': claim_statuses,
-            'denial_reason_code': denial_reason_codes,
-            'denial_reason_description': denial_reason_descriptions,
-            'payment_amount': payment_amounts,
-            'patient_responsibility': patient_responsibilities,
-            'claim_frequency': claim_frequencies,
-            'days_to_payment': days_to_payment
-        }
-        
-        all_claim_chunks.append(pl.DataFrame(claims_data))
-        
-        if chunk_start % (chunk_size * 5) == 0:
-            print(f"  Generated {chunk_start + actual_chunk_size} claims...")
-    
-    return pl.concat(all_claim_chunks)
+    # Lookups shared by every worker process
+    context = {
+        'payer_denial_rates': payer_denial_rates,
+        'prior_auth_matrix': prior_auth_matrix,
+        'provider_denial_modifiers': provider_modifiers,
+        'provider_out_of_network': provider_out_of_network,
+        'num_patients': num_patients,
+        'provider_ids': provider_ids,
+        'days_in_range': days_in_range,
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    
+    return generate_in_chunks(_gen_claim_chunk, num_claims, "claims", seed_offset=1_000_000, context=context)
+
+# Number of rows in an eager or lazy (chunk-backed) dataframe
+def frame_height(df):
+    return df.lazy().select(pl.len()).collect().item()
+
+# Low-cardinality columns written as Categorical so parquet stores them dictionary-encoded
+DICTIONARY_COLUMNS = [
+    'gender', 'state', 'insurance_id', 'specialty', 'network_status', 'credentials', 'facility_name',
+    'payer_id', 'payer_name', 'payer_type', 'primary_diagnosis_code', 'secondary_diagnosis_code', 'procedure_code',
+    'revenue_code', 'place_of_service_code', 'denial_reason_code', 'denial_reason_description', 'code', 'code_type'
+]
 
 # Function to save dataframe in specified formats
 def save_dataframe(df, filename, formats):
     base_path = os.path.join(CONFIG["output_dir"], filename)
     
+    dictionary_columns = [c for c in DICTIONARY_COLUMNS if c in df.collect_schema().names()]
+    
     for fmt in formats:
         if fmt.lower() == 'csv':
-            df.write_csv(f"{base_path}.csv")
+            if isinstance(df, pl.LazyFrame):
+                df.sink_csv(f"{base_path}.csv")
+            else:
+                df.write_csv(f"{base_path}.csv")
             print(f"Saved {filename}.csv")
         elif fmt.lower() == 'parquet':
-            df.write_parquet(f"{base_path}.parquet")
+            df = df.with_columns(pl.col(dictionary_columns).cast(pl.Categorical))
+            if isinstance(df, pl.LazyFrame):
+                # Stream the chunk part files straight into the final file; only a few chunks are ever in memory
+                # (no pl.concat of all chunks), and the native sink is faster than a per-batch ParquetWriter loop
+                df.sink_parquet(f"{base_path}.parquet", compression="zstd", compression_level=3, row_group_size=CONFIG["parquet_row_group_size"])
+            else:
+                table = df.rechunk().to_arrow()
+                with pq.ParquetWriter(f"{base_path}.parquet", table.schema, compression="zstd", compression_level=3, use_dictionary=dictionary_columns) as writer:
+                    writer.write_table(table, row_group_size=CONFIG["parquet_row_group_size"])
             print(f"Saved {filename}.parquet")
 
+# Adds the boolean "_is_denied" column the statistics functions below rely on
+def with_denied_flag(claims_df):
+    denied_status = {"numeric": 1, "boolean": True, "string": "DENIED"}[CONFIG["claim_status_format"]]
+    return claims_df.with_columns((pl.col("claim_status") == denied_status).alias("_is_denied"))
+
 # Calculate overall denial rate from generated data
 def calculate_denial_rate(claims_df):
-    if CONFIG["claim_status_format"] == "numeric":
-        denied_count = claims_df.filter(pl.col("claim_status") == 1).height
-    elif CONFIG["claim_status_format"] == "boolean":
-        denied_count = claims_df.filter(pl.col("claim_status") == True).height
-    else:  # string format
-        denied_count = claims_df.filter(pl.col("claim_status") == "DENIED").height
-        
-    total_count = claims_df.height
-    return denied_count / total_count if total_count > 0 else 0
+    denial_rate = claims_df.lazy().select(pl.col("_is_denied").mean()).collect().item()
+    return denial_rate if denial_rate is not None else 0
 
 # Function to get denial reasons distribution
 def get_denial_reason_distribution(claims_df):
     # Filter for denied claims
-    if CONFIG["claim_status_format"] == "numeric":
-        denied_claims = claims_df.filter(pl.col("claim_status") == 1)
-    elif CONFIG["claim_status_format"] == "boolean":
-        denied_claims = claims_df.filter(pl.col("claim_status") == True)
-    else:  # string format
-        denied_claims = claims_df.filter(pl.col("claim_status") == "DENIED")
-    
-    # Count by category
-    category_counts = {}
-    for category in denial_categories.keys():
-        category_counts[category] = 0
+    denied_claims = claims_df.filter(pl.col("_is_denied"))
+    
+    # Reason codes as their DENIAL_KEYS indices (the Enum physical codes)
+    reason_codes = (
+        denied_claims.lazy()
+        .select(pl.col("denial_reason_code").cast(pl.Enum(DENIAL_KEYS)).to_physical())
+        .collect()
+        .to_series()
+    )
     
-    # Count denials by category
-    reason_codes = denied_claims["denial_reason_code"].to_list()
-    for code in reason_codes:
-        if code:
-            category = category_for_denial_code.get(code, "other")
-            category_counts[category] = category_counts.get(category, 0) + 1
+    # Count denials by category with one gather through the category lookup table
+    category_idx = DENIAL_CATEGORY_LUT[reason_codes.drop_nulls().to_numpy()]
+    category_counts = dict(zip(denial_categories, np.bincount(category_idx, minlength=len(denial_categories)).tolist()))
     
     # Calculate percentages
     total_denials = len(reason_codes)
@@ -763,12 +874,16 @@ def main():
     print(f"  - Target denial rate: {CONFIG['overall_denial_rate']:.2%}")
     
     # Generate all datasets
-    patients_df = generate_patients(CONFIG["num_patients"])
+    faker_pools = build_faker_pools()
+    
+    patients_df = generate_patients(CONFIG["num_patients"], faker_pools)
     
-    providers_df = generate_providers(CONFIG["num_providers"])
+    providers_df = generate_providers(CONFIG["num_providers"], faker_pools)
     
     payers_df = generate_payers(CONFIG["num_payers"])
     
+    code_descriptions_df = generate_code_descriptions()
+    
     claims_df = generate_claims(
         CONFIG["total_claims"], 
         patients_df, 
@@ -783,16 +898,18 @@ def main():
     save_dataframe(providers_df, "synthetic_providers", CONFIG["output_formats"])
     save_dataframe(payers_df, "synthetic_payers", CONFIG["output_formats"])
     save_dataframe(claims_df, "synthetic_claims", CONFIG["output_formats"])
+    save_dataframe(code_descriptions_df, "synthetic_code_descriptions", CONFIG["output_formats"])
     
-    # Calculate and display statistics
+    # Calculate and display statistics (the denial flag is only used here, not written out)
+    claims_df = with_denied_flag(claims_df)
     actual_denial_rate = calculate_denial_rate(claims_df)
     
     print("\nData Generation Complete!")
     print("\nData Statistics:")
-    print(f"  - Total patients: {patients_df.height:,}")
+    print(f"  - Total patients: {frame_height(patients_df):,}")
     print(f"  - Total providers: {providers_df.height:,}")
     print(f"  - Total payers: {payers_df.height:,}")
-    print(f"  - Total claims: {claims_df.height:,}")
+    print(f"  - Total claims: {frame_height(claims_df):,}")
     print(f"  - Overall denial rate: {actual_denial_rate:.2%}")
     
     # Show denial reason distribution
@@ -801,6 +918,8 @@ def main():
     for category, percentage in distribution.items():
         print(f"  - {category}: {percentage:.2%}")
     
+    remove_chunk_parts()
+    
     print("\nFiles saved to:", CONFIG["output_dir"])
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import polars as pl
-import random
+import pyarrow.parquet as pq
 from faker import Faker
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
 import os
 import time
@@ -10,6 +10,7 @@ import time
 
 # Data Volume & Timeframe
 CLAIMS_PER_YEAR = 500000
+CLAIMS_CHUNK_SIZE = 1_000_000 # Claims are generated and written this many rows at a time
 START_DATE = datetime(2022, 1, 1)
 END_DATE = datetime(2024, 12, 31)
 
@@ -28,14 +29,17 @@ CLAIM_STATUS_APPROVED = 0
 OUTPUT_DIR = "synthetic_claims_data"
 CSV_FILENAME = "synthetic_claims.csv"
 PARQUET_FILENAME = "synthetic_claims.parquet"
+# Parquet is always written; CSV is slow and several times larger at this volume, so it is opt-in
+WRITE_CSV = False
+# zstd level 3 with 250k-row groups: few enough groups for fast scans, with min/max statistics for predicate pushdown
+PARQUET_OPTIONS = {"compression": "zstd", "compression_level": 3, "row_group_size": 250_000, "statistics": True}
 # Set to True to also generate separate patient and provider files (memory intensive for large numbers)
 GENERATE_SEPARATE_PATIENT_PROVIDER_FILES = False # Default to False, change if needed
 
 # --- Setup ---
 fake = Faker()
 Faker.seed(0) # for reproducibility
-random.seed(0)
-np.random.seed(0)
+rng = np.random.default_rng(0) # Single PCG64 Generator for all sampling; faster than the legacy np.random functions
 
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
@@ -58,15 +62,6 @@ print("-" * 30)
 
 start_time = time.time()
 
-# --- Generate Unique Entities ---
-print("Generating unique entity IDs...")
-# Using simple sequential IDs prefixed for clarity and uniqueness
-# Ensure the padding (e.g., :08d) is sufficient for the max number of entities
-patient_ids = [f"PAT_{i+1:08d}" for i in range(NUM_UNIQUE_PATIENTS)]
-provider_ids = [f"PROV_{i+1:05d}" for i in range(NUM_UNIQUE_PROVIDERS)]
-payer_ids = [f"PAYER_{i+1:02d}" for i in range(NUM_UNIQUE_PAYERS)]
-print("  Unique entity IDs generated.")
-
 # --- Define Realistic Codes & Distributions ---
 print("Defining codes and distributions...")
 # Sample CPT Codes (with rough frequency weights)
@@ -90,284 +85,255 @@ denial_weight_list = np.array([denial_weights[reason] for reason in denial_reaso
 # !! Consider replacing placeholders with a more comprehensive list if needed !!
 specialties = ['Internal Medicine', 'Pediatrics', 'Family Practice', 'Cardiology', 'Dermatology', 'Radiology', 'Emergency Medicine', 'Psychiatry', 'General Surgery', 'Orthopedics'] # Placeholder specialties
 high_denial_specialties = {'Radiology', 'Emergency Medicine', 'Psychiatry', 'General Surgery'} # Example set
-provider_specialty_map = {prov_id: random.choice(specialties) for prov_id in provider_ids}
+# Specialty code per provider (index into specialties), indexed by provider position so claims can gather it in one step
+provider_specialty_codes = rng.integers(0, len(specialties), size=NUM_UNIQUE_PROVIDERS, dtype=np.int8)
+high_denial_specialty_lut = np.array([specialty in high_denial_specialties for specialty in specialties]) # Indexed by specialty code
+
+# The code lists are fixed, so their columns use Enum dtypes with a known dictionary instead of Categorical.
+# Claim columns are gathered by integer code from these one-entry-per-category Series
+cpt_code_values = pl.Series(cpt_codes, dtype=pl.Enum(cpt_codes))
+icd10_code_values = pl.Series(icd10_codes, dtype=pl.Enum(icd10_codes))
+specialty_values = pl.Series(specialties, dtype=pl.Enum(specialties))
+denial_reason_values = pl.Series(denial_reason_list, dtype=pl.Enum(denial_reason_list))
 
 # Payer Base Denial Rates (assign some higher rates)
-payer_denial_rates = {}
+# Stored as an array indexed by payer position, so per-claim rates can be gathered in one step
 num_high_rate_payers = int(NUM_UNIQUE_PAYERS * 0.25) # ~25% of payers have higher base rates
-high_rate_payers = random.sample(payer_ids, num_high_rate_payers)
-for payer in payer_ids:
-    if payer in high_rate_payers:
-        # Assign higher base denial rate for these payers
-        payer_denial_rates[payer] = random.uniform(BASE_DENIAL_RATE_RANGE[1] * 1.1, BASE_DENIAL_RATE_RANGE[1] * 1.5) # Slightly above target max
-    else:
-        # Assign denial rate around the target range for others
-        payer_denial_rates[payer] = random.uniform(BASE_DENIAL_RATE_RANGE[0] * 0.8, BASE_DENIAL_RATE_RANGE[1] * 1.2) # Around target range
+high_rate_payer_mask = np.zeros(NUM_UNIQUE_PAYERS, dtype=bool)
+high_rate_payer_mask[rng.choice(NUM_UNIQUE_PAYERS, size=num_high_rate_payers, replace=False)] = True
+payer_denial_rate_arr = np.where(
+    high_rate_payer_mask,
+    # Assign higher base denial rate for these payers
+    rng.uniform(BASE_DENIAL_RATE_RANGE[1] * 1.1, BASE_DENIAL_RATE_RANGE[1] * 1.5, size=NUM_UNIQUE_PAYERS), # Slightly above target max
+    # Assign denial rate around the target range for others
+    rng.uniform(BASE_DENIAL_RATE_RANGE[0] * 0.8, BASE_DENIAL_RATE_RANGE[1] * 1.2, size=NUM_UNIQUE_PAYERS), # Around target range
+)
 
 print("  Codes and distributions defined.")
 
 # --- Generate Claims Data ---
-print(f"Generating {total_claims} claims records (this may take a while)...")
-# FIX: Initialize claims_data as an empty list before the loop
-claims_data = []
-denial_count = 0
-
-# Pre-sample choices to speed up the loop
-print("  Pre-sampling random choices...")
-patient_choices = random.choices(patient_ids, k=total_claims)
-provider_choices = random.choices(provider_ids, k=total_claims)
-payer_choices = random.choices(payer_ids, k=total_claims)
-cpt_choices = np.random.choice(cpt_codes, size=total_claims, p=cpt_weights)
-icd10_choices = np.random.choice(icd10_codes, size=total_claims, p=icd10_weights)
-auth_obtained_choices = np.random.rand(total_claims) > 0.15 # 85% True
-coding_mismatch_choices = np.random.rand(total_claims) < 0.08 # 8% True
-docs_incomplete_choices = np.random.rand(total_claims) < 0.10 # 10% True
-denial_reason_choices = np.random.choice(denial_reason_list, size=total_claims, p=denial_weight_list)
-random_determiners = np.random.rand(total_claims) # For final denial decision
-random_reason_overrides = np.random.rand(total_claims, 2) # For reason override logic
-random_paid_percentages = np.random.uniform(0.70, 0.95, size=total_claims) # For approved claims
-print("  Pre-sampling complete.")
-
-# Loop through and generate each claim
-for i in range(total_claims):
-    if (i + 1) % (total_claims // 20) == 0 or i == 0: # Print progress every 5% and at the start
-        progress_percent = (i + 1) / total_claims * 100
-        current_time = time.time()
-        elapsed = current_time - start_time
-        print(f"  Generating claim {i+1}/{total_claims} ({progress_percent:.1f}%) - Elapsed: {elapsed:.1f}s")
-
-    # Basic Claim Info from pre-sampled choices
-    claim_id = f"CLAIM_{i+1:09d}" # Start claim ID from 1 for consistency
-    patient_id = patient_choices[i]
-    provider_id = provider_choices[i]
-    payer_id = payer_choices[i]
-    provider_specialty = provider_specialty_map[provider_id] # Look up specialty
-
-    # Dates
-    date_of_service = START_DATE + timedelta(days=random.randint(0, total_days))
-    submission_lag_days = random.randint(1, 30)
-    claim_submission_date = date_of_service + timedelta(days=submission_lag_days)
-    # Ensure submission date doesn't exceed the overall end date
-    claim_submission_date = min(claim_submission_date, END_DATE)
-
-    # Codes and Charges from pre-sampled choices
-    cpt_code = cpt_choices[i]
-    icd10_code = icd10_choices[i]
-    # Keep some randomness here, maybe base range on CPT code in a future version
-    claim_charge_amount = round(random.uniform(50.0, 5000.0), 2)
-
-    # Factors influencing denial from pre-sampled choices
-    prior_authorization_obtained = auth_obtained_choices[i]
-    coding_mismatch = coding_mismatch_choices[i]
-    documentation_incomplete = docs_incomplete_choices[i]
-
-    # Determine Claim Status (Apply correlations)
-    current_denial_prob = payer_denial_rates[payer_id] # Start with payer base rate
-
-    # Adjust probability based on factors
-    denial_reason_override = None
-    # Factor: Prior Authorization
-    if not prior_authorization_obtained:
-        current_denial_prob = min(current_denial_prob * 3.5, 0.90) # Significantly increase, cap at 90%
-        denial_reason_override = 'NO_AUTH' # Likely reason
-    # Factor: Provider Specialty
-    if provider_specialty in high_denial_specialties:
-        current_denial_prob *= 1.4 # Increase by 40%
-    # Factor: Coding Mismatch
-    if coding_mismatch:
-        current_denial_prob *= 1.8 # Increase by 80%
-        # High chance this is the reason if no other override
-        if denial_reason_override is None and random_reason_overrides[i, 0] < 0.7:
-             denial_reason_override = 'CODING_MISMATCH'
-    # Factor: Documentation Incomplete
-    if documentation_incomplete:
-        current_denial_prob *= 1.7 # Increase by 70%
-        # High chance this is the reason if no other override
-        if denial_reason_override is None and random_reason_overrides[i, 1] < 0.6:
-             denial_reason_override = 'INCOMPLETE_DOCS'
-
-    # Factor: Submission Lag (minor effect)
-    if submission_lag_days > 20:
-         current_denial_prob *= 1.05
-    elif submission_lag_days > 10:
-         current_denial_prob *= 1.02
-
-    # Clamp probability to ensure it stays within reasonable bounds
-    current_denial_prob = max(0.01, min(current_denial_prob, 0.95)) # Keep within 1-95% bounds
-
-    # Final status determination using pre-sampled random number
-    is_denied = random_determiners[i] < current_denial_prob
-    claim_status = CLAIM_STATUS_DENIED if is_denied else CLAIM_STATUS_APPROVED
-
-    # Assign Denial Reason and Paid Amount
-    denial_reason_code = None
-    paid_amount = 0.0
-
-    if claim_status == CLAIM_STATUS_DENIED:
-        denial_count += 1
-        if denial_reason_override:
-            # If a specific factor strongly suggests a reason, use it with high probability
-            if random.random() < 0.85: # 85% chance to use the override reason
-                 denial_reason_code = denial_reason_override
-            else: # Otherwise, pick from pre-sampled weighted list
-                 denial_reason_code = denial_reason_choices[i]
-        else:
-            # Pick from pre-sampled weighted list if no strong factor identified
-            denial_reason_code = denial_reason_choices[i]
-        paid_amount = 0.0
-    else: # Approved
-        # Simulate partial payment based on charge amount using pre-sampled percentage
-        paid_amount = round(claim_charge_amount * random_paid_percentages[i], 2)
-        denial_reason_code = None # Ensure no denial reason for approved claims
-
-    # Append claim record as a dictionary
-    claims_data.append({
-        "claim_id": claim_id,
-        "patient_id": patient_id,
-        "provider_id": provider_id,
-        "payer_id": payer_id,
-        "provider_specialty": provider_specialty,
-        "date_of_service": date_of_service.date(),
-        "claim_submission_date": claim_submission_date.date(),
-        "submission_lag_days": submission_lag_days,
-        "cpt_code": cpt_code,
-        "icd10_code": icd10_code,
-        "claim_charge_amount": claim_charge_amount,
-        "prior_authorization_obtained": prior_authorization_obtained,
-        "coding_mismatch_flag": coding_mismatch,
-        "documentation_incomplete_flag": documentation_incomplete,
-        "claim_status": claim_status,
-        "denial_reason_code": denial_reason_code, # Will be None if approved
-        "paid_amount": paid_amount,
-    })
-
-# --- Create Polars DataFrame ---
-print("Converting generated list to Polars DataFrame...")
-claims_df = pl.DataFrame(claims_data)
-print(f"  Initial DataFrame memory usage: {claims_df.estimated_size('mb'):.2f} MB")
-del claims_data # Free up memory from the list
-print("  List deleted to free memory.")
-
-# Define schema for clarity and potential performance/memory benefits
+# Day numbers and factor tables shared by every chunk
+# Dates are int32 days since the Unix epoch (the physical layout of pl.Date); submission date must not exceed the overall end date
+start_epoch_day = np.datetime64(START_DATE.date(), 'D').astype(np.int32)
+end_epoch_day = np.datetime64(END_DATE.date(), 'D').astype(np.int32)
+# Denial multipliers other than prior authorization are combined into one table indexed by a per-claim factor key,
+# so they are applied with a single gather and in-place multiply instead of one pass per factor
+specialty_factors = np.array([1.0, 1.4]) # Factor: Provider Specialty - increase by 40%
+coding_factors = np.array([1.0, 1.8]) # Factor: Coding Mismatch - increase by 80%
+docs_factors = np.array([1.0, 1.7]) # Factor: Documentation Incomplete - increase by 70%
+lag_factors = np.array([1.0, 1.02, 1.05]) # Factor: Submission Lag (minor effect) - <=10, 11-20, >20 days
+denial_factor_lut = np.multiply.outer(np.multiply.outer(np.multiply.outer(lag_factors, docs_factors), coding_factors), specialty_factors).ravel()
+
+# Define schema for clarity and potential performance/memory benefits.
+# Columns are built with these dtypes directly; the schema is only checked, not cast to
 schema = {
     "claim_id": pl.Utf8,
     "patient_id": pl.Utf8,
     "provider_id": pl.Utf8,
     "payer_id": pl.Utf8,
-    "provider_specialty": pl.Categorical, # Use Categorical for efficiency with repeated strings
+    "provider_specialty": specialty_values.dtype, # Enum of the fixed specialty list
     "date_of_service": pl.Date,
     "claim_submission_date": pl.Date,
     "submission_lag_days": pl.Int16, # Small int type is sufficient
-    "cpt_code": pl.Categorical, # Use Categorical for efficiency
-    "icd10_code": pl.Categorical, # Use Categorical for efficiency
-    "claim_charge_amount": pl.Float64,
+    "cpt_code": cpt_code_values.dtype, # Enum of the fixed code list
+    "icd10_code": icd10_code_values.dtype, # Enum of the fixed code list
+    "claim_charge_amount_cents": pl.Int64, # Money is stored as exact integer cents (Int64, so column sums cannot overflow)
     "prior_authorization_obtained": pl.Boolean,
     "coding_mismatch_flag": pl.Boolean,
     "documentation_incomplete_flag": pl.Boolean,
     "claim_status": pl.Int8, # Use Int8 for 0/1 status
-    "denial_reason_code": pl.Categorical, # Use Categorical for efficiency
-    "paid_amount": pl.Float64,
+    "denial_reason_code": denial_reason_values.dtype, # Enum of the fixed reason list; null for approved claims
+    "paid_amount_cents": pl.Int64,
 }
-print("Casting DataFrame to defined schema...")
-claims_df = claims_df.cast(schema, strict=True) # Use strict=True to catch casting errors
-print(f"  DataFrame memory usage after casting: {claims_df.estimated_size('mb'):.2f} MB")
-print("  DataFrame created and cast to schema.")
+
+csv_path = os.path.join(OUTPUT_DIR, CSV_FILENAME)
+parquet_path = os.path.join(OUTPUT_DIR, PARQUET_FILENAME)
+
+print(f"Generating {total_claims} claims records in chunks of {CLAIMS_CHUNK_SIZE}...")
+# Each chunk is generated from its own column arrays, appended to the Parquet file as soon as it is built,
+# and freed before the next chunk starts, so only one chunk of claims is ever in memory
+denial_count = 0
+peak_chunk_memory_mb = 0.0
+# The context manager writes the Parquet footer on exit, so the file stays readable even if a chunk fails
+with pq.ParquetWriter(
+    parquet_path,
+    pl.DataFrame(schema=schema).to_arrow().schema,
+    compression=PARQUET_OPTIONS["compression"],
+    compression_level=PARQUET_OPTIONS["compression_level"],
+    write_statistics=PARQUET_OPTIONS["statistics"],
+) as claims_writer:
+    for chunk_start in range(0, total_claims, CLAIMS_CHUNK_SIZE):
+        chunk_rows = min(CLAIMS_CHUNK_SIZE, total_claims - chunk_start)
+
+        # Pre-sample all random choices for the chunk
+        patient_idx_choices = rng.integers(0, NUM_UNIQUE_PATIENTS, size=chunk_rows, dtype=np.int32)
+        provider_idx_choices = rng.integers(0, NUM_UNIQUE_PROVIDERS, size=chunk_rows, dtype=np.int32)
+        payer_idx_choices = rng.integers(0, NUM_UNIQUE_PAYERS, size=chunk_rows, dtype=np.int32)
+        specialty_code_choices = provider_specialty_codes[provider_idx_choices]
+        submission_lag_choices = rng.integers(1, 31, size=chunk_rows, dtype=np.int16) # 1-30 days
+        dates_of_service = start_epoch_day + rng.integers(0, total_days + 1, size=chunk_rows, dtype=np.int32)
+        claim_submission_dates = np.minimum(dates_of_service + submission_lag_choices, end_epoch_day)
+        # Codes are sampled as small integer indices; they are gathered into Enum columns when the DataFrame is built
+        cpt_idx_choices = rng.choice(len(cpt_codes), size=chunk_rows, p=cpt_weights).astype(np.int8)
+        icd10_idx_choices = rng.choice(len(icd10_codes), size=chunk_rows, p=icd10_weights).astype(np.int8)
+        auth_obtained_choices = rng.random(chunk_rows) > 0.15 # 85% True
+        coding_mismatch_choices = rng.random(chunk_rows) < 0.08 # 8% True
+        docs_incomplete_choices = rng.random(chunk_rows) < 0.10 # 10% True
+        denial_reason_idx_choices = rng.choice(len(denial_reason_list), size=chunk_rows, p=denial_weight_list).astype(np.int8)
+        random_determiners = rng.random(chunk_rows) # For final denial decision
+        random_reason_overrides = rng.random((chunk_rows, 2)) # For reason override logic
+        # Money is generated as integer cents and percentages as basis points, so no float rounding is needed
+        random_paid_basis_points = rng.integers(7000, 9501, size=chunk_rows) # 70.00%-95.00%, for approved claims
+        # Keep some randomness here, maybe base range on CPT code in a future version
+        claim_charge_cents = rng.integers(5_000, 500_001, size=chunk_rows) # $50.00-$5000.00
+
+        # Determine Claim Status for the whole chunk at once (Apply correlations)
+        denial_probs = payer_denial_rate_arr[payer_idx_choices] # Start with payer base rate (the gather returns a fresh array)
+        # Factor: Prior Authorization (applied first, since its cap comes before the other multipliers)
+        no_auth_mask = ~auth_obtained_choices
+        denial_probs[no_auth_mask] = np.minimum(denial_probs[no_auth_mask] * 3.5, 0.90) # Significantly increase, cap at 90%
+        lag_buckets = (submission_lag_choices > 10).astype(np.int8) + (submission_lag_choices > 20)
+        denial_factor_keys = lag_buckets * 8 + docs_incomplete_choices * 4 + coding_mismatch_choices * 2 + high_denial_specialty_lut[specialty_code_choices]
+        denial_probs *= denial_factor_lut[denial_factor_keys]
+        # Clamp probability to ensure it stays within reasonable bounds
+        np.clip(denial_probs, 0.01, 0.95, out=denial_probs) # Keep within 1-95% bounds
+
+        # Final status determination using pre-sampled random numbers
+        is_denied_choices = random_determiners < denial_probs
+        denial_count += int(is_denied_choices.sum())
+        claim_statuses = np.where(is_denied_choices, CLAIM_STATUS_DENIED, CLAIM_STATUS_APPROVED).astype(np.int8)
+        # Inputs are released as soon as the column derived from them is final, keeping the chunk's working set small
+        del random_determiners, denial_probs, no_auth_mask, lag_buckets, denial_factor_keys
+
+        # Simulate partial payment of approved claims based on charge amount using pre-sampled percentages.
+        # Computed in integer cents (rounded half up) in place, denied claims zeroed
+        paid_cents = np.multiply(claim_charge_cents, random_paid_basis_points, out=random_paid_basis_points)
+        paid_cents += 5_000
+        paid_cents //= 10_000
+        paid_cents[is_denied_choices] = 0
+        del random_paid_basis_points
+
+        # Start claim ID from 1 for consistency, continuing across chunks
+        claim_ids = np.char.add("CLAIM_", np.char.zfill(np.arange(chunk_start + 1, chunk_start + chunk_rows + 1).astype("U9"), 9))
+
+        # Likely denial reason suggested by each claim's factors, as an index into denial_reason_list (-1 = none).
+        # Assigned lowest precedence first, so NO_AUTH > CODING_MISMATCH > INCOMPLETE_DOCS
+        denial_reason_override_idx = np.full(chunk_rows, -1, dtype=np.int8)
+        # High chance these are the reason if no other override
+        denial_reason_override_idx[docs_incomplete_choices & (random_reason_overrides[:, 1] < 0.6)] = denial_reason_list.index('INCOMPLETE_DOCS')
+        denial_reason_override_idx[coding_mismatch_choices & (random_reason_overrides[:, 0] < 0.7)] = denial_reason_list.index('CODING_MISMATCH')
+        denial_reason_override_idx[~auth_obtained_choices] = denial_reason_list.index('NO_AUTH')
+
+        # If a specific factor strongly suggests a reason, use it with high probability (85%);
+        # otherwise pick from the pre-sampled weighted list. Approved claims get no denial reason
+        use_override = (denial_reason_override_idx >= 0) & (rng.random(chunk_rows) < 0.85)
+        denial_reason_idx = np.where(use_override, denial_reason_override_idx, denial_reason_idx_choices)
+        denial_reason_codes = denial_reason_values.gather(denial_reason_idx).set(pl.Series(~is_denied_choices), None)
+        del random_reason_overrides, denial_reason_override_idx, use_override, denial_reason_idx, denial_reason_idx_choices, is_denied_choices
+
+        # --- Create Polars DataFrame for the chunk ---
+        # One array per column, built with its final dtype, so no cast pass over the frame is needed
+        chunk_df = pl.DataFrame({
+            "claim_id": claim_ids,
+            # Entity numbers, formatted as PAT_########, PROV_##### and PAYER_## below
+            "patient_id": patient_idx_choices + 1,
+            "provider_id": provider_idx_choices + 1,
+            "payer_id": payer_idx_choices + 1,
+            "provider_specialty": specialty_values.gather(specialty_code_choices),
+            "date_of_service": pl.Series(dates_of_service, dtype=pl.Date),
+            "claim_submission_date": pl.Series(claim_submission_dates, dtype=pl.Date),
+            "submission_lag_days": submission_lag_choices,
+            "cpt_code": cpt_code_values.gather(cpt_idx_choices),
+            "icd10_code": icd10_code_values.gather(icd10_idx_choices),
+            "claim_charge_amount_cents": claim_charge_cents,
+            "prior_authorization_obtained": auth_obtained_choices,
+            "coding_mismatch_flag": coding_mismatch_choices,
+            "documentation_incomplete_flag": docs_incomplete_choices,
+            "claim_status": claim_statuses,
+            "denial_reason_code": denial_reason_codes,
+            "paid_amount_cents": paid_cents,
+        })
+        chunk_df = chunk_df.with_columns(
+            ("PAT_" + pl.col("patient_id").cast(pl.Utf8).str.zfill(8)).alias("patient_id"),
+            ("PROV_" + pl.col("provider_id").cast(pl.Utf8).str.zfill(5)).alias("provider_id"),
+            ("PAYER_" + pl.col("payer_id").cast(pl.Utf8).str.zfill(2)).alias("payer_id"),
+        )
+        peak_chunk_memory_mb = max(peak_chunk_memory_mb, chunk_df.estimated_size('mb'))
+        assert chunk_df.schema == schema, f"Unexpected claims schema: {chunk_df.schema}"
+        claims_writer.write_table(chunk_df.to_arrow(), row_group_size=PARQUET_OPTIONS["row_group_size"])
+        # Free up memory from the remaining source arrays before the next chunk
+        del claim_ids, patient_idx_choices, provider_idx_choices, payer_idx_choices, specialty_code_choices
+        del dates_of_service, claim_submission_dates, submission_lag_choices, cpt_idx_choices, icd10_idx_choices
+        del auth_obtained_choices, coding_mismatch_choices, docs_incomplete_choices, claim_statuses
+        del denial_reason_codes, claim_charge_cents, paid_cents, chunk_df
+        print(f"  Generated {chunk_start + chunk_rows}/{total_claims} claims - Elapsed: {time.time() - start_time:.1f}s")
+
+print(f"  Claims data saved to Parquet: {parquet_path}")
 
 # --- Generate Separate Patient/Provider Files (Optional) ---
 if GENERATE_SEPARATE_PATIENT_PROVIDER_FILES:
     print("Generating separate patient file...")
-    # FIX: Initialize patient_data as an empty list
-    patient_data = []
-    # Generate patient details - this can be slow for millions
-    # Consider generating only a subset or simplifying if performance is critical
-    # Limit generation for performance if needed, e.g., first 50k
-    num_patients_to_generate = min(len(patient_ids), 50000)
+    # Faker is only called to fill a small zip code pool; per-row values are sampled from it with the rng
+    zip_code_pool = np.array([fake.zipcode() for _ in range(1000)])
+    # Limit generation to the first 50k patients to keep the file small
+    num_patients_to_generate = min(NUM_UNIQUE_PATIENTS, 50000)
     print(f"  Generating details for {num_patients_to_generate} patients...")
-    for i, pat_id in enumerate(patient_ids[:num_patients_to_generate]):
-         if (i + 1) % 5000 == 0:
-             print(f"    Generated details for {i+1}/{num_patients_to_generate} patients...")
-         patient_data.append({
-             "patient_id": pat_id,
-             "age": random.randint(0, 95),
-             "gender": random.choice(['Male', 'Female', 'Other']),
-             "zip_code": fake.zipcode(),
-             # Add more fields as needed (e.g., medical history flags)
-         })
-    patients_df = pl.DataFrame(patient_data)
-    # Define schema for patient data
-    patient_schema = {
-        "patient_id": pl.Utf8,
-        "age": pl.Int8,
-        "gender": pl.Categorical,
-        "zip_code": pl.Utf8
-    }
-    patients_df = patients_df.cast(patient_schema, strict=True)
+    patients_df = pl.DataFrame({
+        "patient_id": np.char.add("PAT_", np.char.zfill(np.arange(1, num_patients_to_generate + 1).astype("U8"), 8)),
+        "age": rng.integers(0, 96, size=num_patients_to_generate, dtype=np.int8),
+        "gender": pl.Series(np.array(['Male', 'Female', 'Other'])[rng.integers(0, 3, size=num_patients_to_generate)], dtype=pl.Categorical),
+        "zip_code": zip_code_pool[rng.integers(0, len(zip_code_pool), size=num_patients_to_generate)],
+        # Add more fields as needed (e.g., medical history flags)
+    })
     patients_csv_path = os.path.join(OUTPUT_DIR, "synthetic_patients.csv")
     patients_parquet_path = os.path.join(OUTPUT_DIR, "synthetic_patients.parquet")
-    print(f"  Saving patient data to CSV: {patients_csv_path}")
-    patients_df.write_csv(patients_csv_path)
+    if WRITE_CSV:
+        print(f"  Saving patient data to CSV: {patients_csv_path}")
+        patients_df.write_csv(patients_csv_path)
     print(f"  Saving patient data to Parquet: {patients_parquet_path}")
-    patients_df.write_parquet(patients_parquet_path)
+    patients_df.write_parquet(patients_parquet_path, **PARQUET_OPTIONS)
     print("  Patient file saved.")
-    del patient_data # Free memory
-    del patients_df
+    del patients_df # Free memory
 
     print("Generating separate provider file...")
-    # FIX: Initialize provider_data as an empty list
-    provider_data = []
-    print(f"  Generating details for {len(provider_ids)} providers...")
-    for i, prov_id in enumerate(provider_ids):
-         if (i + 1) % 5000 == 0:
-             print(f"    Generated details for {i+1}/{len(provider_ids)} providers...")
-         provider_data.append({
-             "provider_id": prov_id,
-             "provider_specialty": provider_specialty_map[prov_id],
-             "provider_npi": fake.unique.numerify(text='##########'), # Fake NPI
-             "provider_zip_code": fake.zipcode(),
-             "clinic_name": "ANEC", # As requested
-             # Add more fields as needed (e.g., years_experience)
-         })
-    providers_df = pl.DataFrame(provider_data)
-    # Define schema for provider data
-    provider_schema = {
-        "provider_id": pl.Utf8,
-        "provider_specialty": pl.Categorical,
-        "provider_npi": pl.Utf8,
-        "provider_zip_code": pl.Utf8,
-        "clinic_name": pl.Utf8
-    }
-    # Cast provider specialty to Categorical for consistency and efficiency
-    providers_df = providers_df.cast(provider_schema, strict=True)
+    print(f"  Generating details for {NUM_UNIQUE_PROVIDERS} providers...")
+    providers_df = pl.DataFrame({
+        "provider_id": np.char.add("PROV_", np.char.zfill(np.arange(1, NUM_UNIQUE_PROVIDERS + 1).astype("U5"), 5)),
+        "provider_specialty": specialty_values.gather(provider_specialty_codes),
+        # Fake 10-digit NPIs, unique across providers
+        "provider_npi": (rng.choice(9_000_000_000, size=NUM_UNIQUE_PROVIDERS, replace=False) + 1_000_000_000).astype("U10"),
+        "provider_zip_code": zip_code_pool[rng.integers(0, len(zip_code_pool), size=NUM_UNIQUE_PROVIDERS)],
+        "clinic_name": "ANEC", # As requested
+        # Add more fields as needed (e.g., years_experience)
+    })
     providers_csv_path = os.path.join(OUTPUT_DIR, "synthetic_providers.csv")
     providers_parquet_path = os.path.join(OUTPUT_DIR, "synthetic_providers.parquet")
-    print(f"  Saving provider data to CSV: {providers_csv_path}")
-    providers_df.write_csv(providers_csv_path)
+    if WRITE_CSV:
+        print(f"  Saving provider data to CSV: {providers_csv_path}")
+        providers_df.write_csv(providers_csv_path)
     print(f"  Saving provider data to Parquet: {providers_parquet_path}")
-    providers_df.write_parquet(providers_parquet_path)
+    providers_df.write_parquet(providers_parquet_path, **PARQUET_OPTIONS)
     print("  Provider file saved.")
-    del provider_data # Free memory
-    del providers_df
+    del providers_df # Free memory
 else:
     print("Skipping generation of separate patient/provider files as per configuration.")
 
 
 # --- Save Main Claims Output ---
-csv_path = os.path.join(OUTPUT_DIR, CSV_FILENAME)
-parquet_path = os.path.join(OUTPUT_DIR, PARQUET_FILENAME)
-
-print(f"Saving main claims data to CSV: {csv_path}")
-claims_df.write_csv(csv_path)
-print("  CSV saved.")
-
-print(f"Saving main claims data to Parquet: {parquet_path}")
-claims_df.write_parquet(parquet_path)
-print("  Parquet saved.")
+# The Parquet file is written chunk by chunk during generation; everything below reads it back lazily.
+# Downstream readers should select only the columns they need (e.g. pl.scan_parquet(...).select(...))
+if WRITE_CSV:
+    # Derived from the written Parquet file by a streaming scan, rather than re-running the in-memory plan
+    print(f"Saving main claims data to CSV: {csv_path}")
+    pl.scan_parquet(parquet_path).sink_csv(csv_path)
+    print("  CSV saved.")
 
 # --- Final Report ---
 end_time = time.time()
 elapsed_time = end_time - start_time
 actual_denial_rate = (denial_count / total_claims) * 100 if total_claims > 0 else 0
-final_df_rows = len(claims_df)
+claims_output_lf = pl.scan_parquet(parquet_path)
+final_df_rows = claims_output_lf.select(pl.len()).collect().item() # Answered from the Parquet metadata
 
 print("-" * 30)
 print("Data Generation Complete!")
@@ -375,16 +341,12 @@ print(f"Total time: {elapsed_time:.2f} seconds ({elapsed_time/60:.2f} minutes)")
 print(f"Target claims: {total_claims}")
 print(f"Actual claims generated: {final_df_rows}")
 print(f"Actual denial rate: {actual_denial_rate:.2f}% (Target: {BASE_DENIAL_RATE_RANGE[0]*100:.1f}% - {BASE_DENIAL_RATE_RANGE[1]*100:.1f}%)")
-print(f"Final DataFrame memory usage: {claims_df.estimated_size('mb'):.2f} MB")
+print(f"Peak chunk DataFrame memory usage: {peak_chunk_memory_mb:.2f} MB")
 print(f"Output files saved in directory: {OUTPUT_DIR}")
 print("-" * 30)
 
-# Display sample data and schema
+# Display sample data and schema; only the first rows are read back from the file
 print("DataFrame Schema:")
-print(claims_df.schema)
+print(claims_output_lf.collect_schema())
 print("\nSample Data (first 5 rows):")
-print(claims_df.head())
-
-# Clear the large DataFrame from memory if no longer needed immediately
-# del claims_df
-# print("Claims DataFrame cleared from memory.")
+print(claims_output_lf.head().collect())